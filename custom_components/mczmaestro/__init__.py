@@ -3,11 +3,18 @@ import asyncio
 from datetime import timedelta
 import logging
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers import device_registry as dr
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+    CONF_TIMEOUT,
+)
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
@@ -15,40 +22,231 @@ from homeassistant.helpers.update_coordinator import (
 )
 from homeassistant.util import slugify
 
-from .const import CONTROLLER, COORDINATOR, DOMAIN, PLATFORMS, UNDO_UPDATE_LISTENER
-from .maestro import MaestroController
+from .const import (
+    ATTR_CLEAR,
+    ATTR_DAYS,
+    ATTR_ENTRY_ID,
+    ATTR_FLUE_LOSS_PER_KELVIN,
+    ATTR_MAX_SAMPLE_GAP,
+    ATTR_PELLET_KG_PER_REVOLUTION,
+    ATTR_PELLET_KWH_PER_KG,
+    ATTR_TRACES,
+    AGGREGATE_NONE,
+    CONF_COMMAND_BURST,
+    CONF_COMMAND_RATE,
+    CONF_FAN_MIN_DELTA,
+    CONF_FUME_MIN_DELTA,
+    CONF_PUBLISH_AGGREGATE,
+    CONF_PUBLISH_MIN_INTERVAL,
+    CONF_PUBLISH_WINDOW,
+    CONF_TEMPERATURE_MIN_DELTA,
+    CONF_TRACE_BUFFER_SIZE,
+    CONF_TRACE_SAMPLE_RATE,
+    CONTROLLER,
+    COORDINATOR,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    EVENT_ANALYTICS,
+    EVENT_TRACES,
+    PLATFORMS,
+    PUBLISHER,
+    SCHEDULER,
+    SERVICE_COMPUTE_ANALYTICS,
+    SERVICE_DUMP_TRACES,
+    TRACER,
+    UNDO_UPDATE_LISTENER,
+)
+from .maestro import DEFAULT_TIMEOUT, MaestroController, process_infostring
+from .maestro.publish import (
+    DEFAULT_AGGREGATE,
+    DEFAULT_FAN_MIN_DELTA,
+    DEFAULT_FUME_MIN_DELTA,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_TEMPERATURE_MIN_DELTA,
+    DEFAULT_WINDOW,
+    MaestroPublisher,
+    PublishPolicy,
+    build_publish_policies,
+)
+from .maestro.scheduler import (
+    DEFAULT_BURST,
+    DEFAULT_RATE,
+    MaestroCommandError,
+    MaestroCommandScheduler,
+)
+from .maestro.tracing import (
+    DEFAULT_BUFFER_SIZE,
+    DEFAULT_SAMPLE_RATE,
+    NO_TRACE,
+    MaestroTracer,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+CALIBRATION_ATTRS = [
+    ATTR_PELLET_KG_PER_REVOLUTION,
+    ATTR_PELLET_KWH_PER_KG,
+    ATTR_FLUE_LOSS_PER_KELVIN,
+    ATTR_MAX_SAMPLE_GAP,
+]
+
+COMPUTE_ANALYTICS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_DAYS, default=7): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=366)
+        ),
+        vol.Optional(ATTR_PELLET_KG_PER_REVOLUTION): cv.positive_float,
+        vol.Optional(ATTR_PELLET_KWH_PER_KG): cv.positive_float,
+        vol.Optional(ATTR_FLUE_LOSS_PER_KELVIN): cv.positive_float,
+        vol.Optional(ATTR_MAX_SAMPLE_GAP): cv.positive_float,
+    }
+)
+
+DUMP_TRACES_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_CLEAR, default=False): cv.boolean,
+    }
+)
+
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the IP integration."""
     hass.data.setdefault(DOMAIN, {})
+
+    async def async_compute_analytics_service(call: ServiceCall) -> None:
+        """Compute heat output and pellet consumption of the stoves."""
+        # numpy and the recorder are only loaded when analytics are requested
+        # pylint: disable-next=import-outside-toplevel
+        from .analytics import AnalyticsCalibration, async_compute_analytics
+
+        calibration = AnalyticsCalibration(
+            **{attr: call.data[attr] for attr in CALIBRATION_ATTRS if attr in call.data}
+        )
+        for entry_id, data in list(hass.data[DOMAIN].items()):
+            if call.data.get(ATTR_ENTRY_ID, entry_id) != entry_id:
+                continue
+            days = await async_compute_analytics(
+                hass, data[CONTROLLER], call.data[ATTR_DAYS], calibration
+            )
+            hass.bus.async_fire(
+                EVENT_ANALYTICS, {ATTR_ENTRY_ID: entry_id, ATTR_DAYS: days}
+            )
+
+    async def async_dump_traces_service(call: ServiceCall) -> None:
+        """Fire the buffered traces of the stoves."""
+        for entry_id, data in hass.data[DOMAIN].items():
+            if call.data.get(ATTR_ENTRY_ID, entry_id) != entry_id:
+                continue
+            traces = data[TRACER].dump(call.data[ATTR_CLEAR])
+            _LOGGER.info(
+                "%s traces dumped for %s:%s",
+                len(traces),
+                data[CONF_HOST],
+                data[CONF_PORT],
+            )
+            hass.bus.async_fire(
+                EVENT_TRACES, {ATTR_ENTRY_ID: entry_id, ATTR_TRACES: traces}
+            )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_COMPUTE_ANALYTICS,
+        async_compute_analytics_service,
+        schema=COMPUTE_ANALYTICS_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_DUMP_TRACES,
+        async_dump_traces_service,
+        schema=DUMP_TRACES_SCHEMA,
+    )
+
     return True
 
 
+OPTION_DEFAULTS = {
+    CONF_SCAN_INTERVAL: DEFAULT_SCAN_INTERVAL,
+    CONF_TIMEOUT: DEFAULT_TIMEOUT,
+    CONF_COMMAND_RATE: DEFAULT_RATE,
+    CONF_COMMAND_BURST: DEFAULT_BURST,
+    CONF_TEMPERATURE_MIN_DELTA: DEFAULT_TEMPERATURE_MIN_DELTA,
+    CONF_FUME_MIN_DELTA: DEFAULT_FUME_MIN_DELTA,
+    CONF_FAN_MIN_DELTA: DEFAULT_FAN_MIN_DELTA,
+    CONF_PUBLISH_MIN_INTERVAL: DEFAULT_MIN_INTERVAL,
+    CONF_PUBLISH_WINDOW: DEFAULT_WINDOW,
+    CONF_PUBLISH_AGGREGATE: DEFAULT_AGGREGATE,
+    CONF_TRACE_SAMPLE_RATE: DEFAULT_SAMPLE_RATE,
+    CONF_TRACE_BUFFER_SIZE: DEFAULT_BUFFER_SIZE,
+}
+
+
+def get_options(entry: ConfigEntry) -> dict:
+    """Return the tuning options of an entry, falling back to its data."""
+    return {
+        key: entry.options.get(key, entry.data.get(key, default))
+        for key, default in OPTION_DEFAULTS.items()
+    }
+
+
+def get_publish_policies(options: dict) -> dict[str, PublishPolicy]:
+    """Return the publishing policies from the options."""
+    aggregate = options[CONF_PUBLISH_AGGREGATE]
+    return build_publish_policies(
+        temperature_min_delta=options[CONF_TEMPERATURE_MIN_DELTA],
+        fume_min_delta=options[CONF_FUME_MIN_DELTA],
+        fan_min_delta=options[CONF_FAN_MIN_DELTA],
+        min_interval=options[CONF_PUBLISH_MIN_INTERVAL],
+        window=options[CONF_PUBLISH_WINDOW],
+        aggregate=None if aggregate == AGGREGATE_NONE else aggregate,
+    )
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up MCZ Maestro from a config entry."""
     config = entry.data
+    options = get_options(entry)
 
-    controller = MaestroController(config[CONF_HOST], config[CONF_PORT])
+    controller = MaestroController(
+        config[CONF_HOST], config[CONF_PORT], options[CONF_TIMEOUT]
+    )
 
     if not controller.connected:
         _LOGGER.error("Can't connect to MCZ")
         raise ConfigEntryNotReady
     _LOGGER.debug("Connected to MCZ")
 
+    publisher = MaestroPublisher(get_publish_policies(options))
+    tracer = MaestroTracer(
+        options[CONF_TRACE_SAMPLE_RATE], options[CONF_TRACE_BUFFER_SIZE]
+    )
+
     async def async_update_data():
         """Fetch data from API."""
-        controller.send("C|RecuperoInfo")
-        return controller.receive()
+        trace = coordinator.trace = tracer.trace("update")
+        try:
+            with trace.span("send"):
+                controller.send("C|RecuperoInfo")
+            with trace.span("recv"):
+                message = controller.receive_raw()
+            trace.log("message %s", message)
+            with trace.span("decode"):
+                data = process_infostring(message)
+            with trace.span("publish"):
+                return publisher.process(data)
+        except Exception:
+            # the entities are not updated after repeated failures, record it now
+            coordinator.trace = NO_TRACE
+            tracer.record(trace)
+            raise
 
-    coordinator = DataUpdateCoordinator(
+    coordinator = MczDataUpdateCoordinator(
         hass,
-        _LOGGER,
+        tracer,
         name=DOMAIN,
         update_method=async_update_data,
-        update_interval=timedelta(seconds=config[CONF_SCAN_INTERVAL]),
+        update_interval=timedelta(seconds=options[CONF_SCAN_INTERVAL]),
     )
 
     await coordinator.async_refresh()
@@ -56,11 +254,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if not coordinator.last_update_success:
         raise ConfigEntryNotReady
 
+    scheduler = MaestroCommandScheduler(
+        controller.send, options[CONF_COMMAND_RATE], options[CONF_COMMAND_BURST]
+    )
+
     undo_listener = entry.add_update_listener(_async_update_listener)
 
     hass.data[DOMAIN][entry.entry_id] = {
         CONTROLLER: controller,
         COORDINATOR: coordinator,
+        SCHEDULER: scheduler,
+        PUBLISHER: publisher,
+        TRACER: tracer,
         CONF_HOST: controller.host,
         CONF_PORT: controller.port,
         UNDO_UPDATE_LISTENER: undo_listener,
@@ -84,8 +289,24 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry):
-    """Handle options update."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Handle options update, only a new host or port needs a reload."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    if (
+        entry.data[CONF_HOST] != data[CONF_HOST]
+        or str(entry.data[CONF_PORT]) != data[CONF_PORT]
+    ):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    options = get_options(entry)
+    data[CONTROLLER].set_timeout(options[CONF_TIMEOUT])
+    data[COORDINATOR].update_interval = timedelta(seconds=options[CONF_SCAN_INTERVAL])
+    data[SCHEDULER].configure(options[CONF_COMMAND_RATE], options[CONF_COMMAND_BURST])
+    data[PUBLISHER].configure(get_publish_policies(options))
+    data[TRACER].configure(
+        options[CONF_TRACE_SAMPLE_RATE], options[CONF_TRACE_BUFFER_SIZE]
+    )
+    _LOGGER.debug("Options applied to %s:%s", data[CONF_HOST], data[CONF_PORT])
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -102,20 +323,46 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data[DOMAIN][entry.entry_id][UNDO_UPDATE_LISTENER]()
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        await data[SCHEDULER].async_stop()
+        await hass.async_add_executor_job(data[CONTROLLER].close)
 
     return unload_ok
 
 
+class MczDataUpdateCoordinator(DataUpdateCoordinator):
+    """Coordinator timing the entity updates of the sampled refreshes."""
+
+    def __init__(self, hass: HomeAssistant, tracer: MaestroTracer, **kwargs) -> None:
+        """Initialize the coordinator."""
+        super().__init__(hass, _LOGGER, **kwargs)
+        self.tracer = tracer
+        self.trace = NO_TRACE
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the entities, then record the trace of the refresh."""
+        trace, self.trace = self.trace, NO_TRACE
+        with trace.span("entity_update"):
+            super().async_update_listeners()
+        self.tracer.record(trace)
+
+
 class MczEntity(CoordinatorEntity):
     """Representation of a generic MCZ entity."""
 
     def __init__(
-        self, controller: MaestroController, coordinator, name: str, command_name
+        self,
+        controller: MaestroController,
+        scheduler: MaestroCommandScheduler,
+        coordinator,
+        name: str,
+        command_name,
     ):
         """Initialize the sensor."""
         super().__init__(coordinator)
         self.controller = controller
+        self.scheduler = scheduler
         self._command_name = command_name
 
         self._attr_name = name
@@ -135,3 +382,10 @@ class MczEntity(CoordinatorEntity):
         }
 
         self._state = None
+
+    async def async_send_command(self, message: str) -> None:
+        """Send a command to the stove and wait for it to be sent."""
+        try:
+            await self.scheduler.async_send(message)
+        except MaestroCommandError as err:
+            raise HomeAssistantError(str(err)) from err
@@ -0,0 +1,187 @@
+"""Heat output and pellet consumption analytics for the MCZ Maestro integration."""
+from datetime import datetime, timedelta
+import logging
+
+import numpy as np
+
+from homeassistant.components.recorder import get_instance, history
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    statistics_during_period,
+)
+from homeassistant.const import ENERGY_KILO_WATT_HOUR, MASS_KILOGRAMS
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN
+from .maestro import MaestroController
+from .maestro.analytics import (
+    ANALYTICS_FIELDS,
+    AnalyticsCalibration,
+    compute_daily_analytics,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _load_history(
+    hass: HomeAssistant, entity_id: str, start: datetime, end: datetime
+) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Load the state entity history into arrays.
+
+    The fields are attributes of the state sensor, the rows where only the
+    attributes changed are needed.
+    """
+    states = history.get_significant_states(
+        hass,
+        start,
+        end,
+        [entity_id],
+        include_start_time_state=True,
+        significant_changes_only=False,
+    ).get(entity_id, [])
+
+    timestamps = np.fromiter(
+        (max(state.last_updated, start).timestamp() for state in states),
+        dtype=float,
+        count=len(states),
+    )
+    samples = {}
+    for field in ANALYTICS_FIELDS:
+        samples[field] = np.fromiter(
+            (_to_float(state.attributes.get(field)) for state in states),
+            dtype=float,
+            count=len(states),
+        )
+    return timestamps, samples
+
+
+def _to_float(value) -> float:
+    """Convert an attribute to float, nan if not set."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _get_sum_before(hass: HomeAssistant, statistic_id: str, start: datetime) -> float:
+    """Return the sum of the last statistic row before start."""
+    rows = statistics_during_period(
+        hass,
+        dt_util.utc_from_timestamp(0),
+        start,
+        {statistic_id},
+        "hour",
+        None,
+        {"sum"},
+    ).get(statistic_id)
+    if not rows:
+        return 0.0
+    return rows[-1]["sum"] or 0.0
+
+
+def _statistic_start(day_start: datetime) -> datetime:
+    """Return the hour holding a day start, statistics must start on the hour.
+
+    Local midnight is not on the hour in UTC for half-hour offsets.
+    """
+    return day_start.replace(minute=0, second=0, microsecond=0)
+
+
+async def _async_import_statistics(
+    hass: HomeAssistant,
+    statistic_id: str,
+    name: str,
+    unit: str,
+    day_starts: list[datetime],
+    values: np.ndarray,
+) -> None:
+    """Import the days, overwriting the statistics already imported for them.
+
+    The days end today, no later row needs its sum updated.
+    """
+    starts = [_statistic_start(day_start) for day_start in day_starts]
+    last_sum = await get_instance(hass).async_add_executor_job(
+        _get_sum_before, hass, statistic_id, starts[0]
+    )
+
+    statistics = []
+    for start, value in zip(starts, values):
+        last_sum += float(value)
+        statistics.append(StatisticData(start=start, state=float(value), sum=last_sum))
+
+    metadata = StatisticMetaData(
+        has_mean=False,
+        has_sum=True,
+        name=name,
+        source=DOMAIN,
+        statistic_id=statistic_id,
+        unit_of_measurement=unit,
+    )
+    async_add_external_statistics(hass, metadata, statistics)
+
+
+async def async_compute_analytics(
+    hass: HomeAssistant,
+    controller: MaestroController,
+    days: int,
+    calibration: AnalyticsCalibration,
+) -> list[dict]:
+    """Compute the analytics of the last full days and import them as statistics."""
+    state_unique_id = slugify(
+        "_".join([DOMAIN, controller.host, controller.port, "state"])
+    )
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, state_unique_id
+    )
+    if entity_id is None:
+        _LOGGER.warning(
+            "No state sensor for %s:%s, analytics skipped",
+            controller.host,
+            controller.port,
+        )
+        return []
+
+    today = dt_util.start_of_local_day()
+    day_starts = [
+        dt_util.as_utc(dt_util.start_of_local_day((today - timedelta(days=i)).date()))
+        for i in range(days, -1, -1)
+    ]
+    day_bounds = np.array([day_start.timestamp() for day_start in day_starts])
+
+    timestamps, samples = await get_instance(hass).async_add_executor_job(
+        _load_history, hass, entity_id, day_starts[0], day_starts[-1]
+    )
+    result = compute_daily_analytics(timestamps, samples, day_bounds, calibration)
+
+    object_id = slugify(f"{controller.host}_{controller.port}")
+    name = f"MCZ Maestro {controller.host}:{controller.port}"
+    await _async_import_statistics(
+        hass,
+        f"{DOMAIN}:{object_id}_heat_output",
+        f"{name} heat output",
+        ENERGY_KILO_WATT_HOUR,
+        day_starts[:-1],
+        result["heat_kwh"],
+    )
+    await _async_import_statistics(
+        hass,
+        f"{DOMAIN}:{object_id}_pellet_consumption",
+        f"{name} pellet consumption",
+        MASS_KILOGRAMS,
+        day_starts[:-1],
+        result["pellet_kg"],
+    )
+
+    return [
+        {
+            "date": dt_util.as_local(day_start).date().isoformat(),
+            "heat_kwh": round(float(result["heat_kwh"][i]), 3),
+            "pellet_kg": round(float(result["pellet_kg"][i]), 3),
+            "burn_hours": round(float(result["burn_hours"][i]), 2),
+            "mean_power_level": round(float(result["mean_power_level"][i]), 2),
+        }
+        for i, day_start in enumerate(day_starts[:-1])
+    ]
@@ -1,4 +1,5 @@
 """Support for the MCZ climate."""
+import asyncio
 import logging
 from typing import Any
 
@@ -14,7 +15,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import MczEntity
-from .const import CONTROLLER, COORDINATOR, DOMAIN
+from .const import CONTROLLER, COORDINATOR, DOMAIN, SCHEDULER
 from .maestro import get_maestro_power_state
 
 _LOGGER = logging.getLogger(__name__)
@@ -29,11 +30,12 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][config_entry.entry_id]
     controller = data[CONTROLLER]
     coordinator = data[COORDINATOR]
+    scheduler = data[SCHEDULER]
 
     entities = []
 
     entities.append(
-        MczClimateEntity(controller, coordinator, "Stove", "stove"),
+        MczClimateEntity(controller, scheduler, coordinator, "Stove", "stove"),
     )
     if entities:
         async_add_entities(entities)
@@ -77,21 +79,32 @@ class MczClimateEntity(MczEntity, ClimateEntity):
 
     async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set new target temperature."""
-        self.controller.send(f"C|WriteParametri|42|{float(kwargs[ATTR_TEMPERATURE])*2}")
+        await self.async_send_command(
+            f"C|WriteParametri|42|{float(kwargs[ATTR_TEMPERATURE])*2}"
+        )
         await self.coordinator.async_request_refresh()
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set new target hvac mode."""
         if self.coordinator.data["Stove_State"] == 0:
-            self.controller.send("C|WriteParametri|34|1")
+            await self.async_send_command("C|WriteParametri|34|1")
         if hvac_mode == HVACMode.AUTO:
-            self.controller.send("C|WriteParametri|40|1")
+            await self.async_send_command("C|WriteParametri|40|1")
         elif hvac_mode == HVACMode.HEAT:
-            self.controller.send("C|WriteParametri|40|0")
+            await self.async_send_command("C|WriteParametri|40|0")
         elif hvac_mode == HVACMode.OFF:
-            # turn off eco and dynamic mode and shutdown
-            self.controller.send("C|WriteParametri|41|0")
-            self.controller.send("C|WriteParametri|1111|0")
-            self.controller.send("C|WriteParametri|34|40")
+            # shutdown and turn off eco and chrono modes, queued together so the
+            # scheduler sends the shutdown first, a mode failure must not stop it
+            shutdown, *modes = await asyncio.gather(
+                self.async_send_command("C|WriteParametri|34|40"),
+                self.async_send_command("C|WriteParametri|41|0"),
+                self.async_send_command("C|WriteParametri|1111|0"),
+                return_exceptions=True,
+            )
+            for error in modes:
+                if isinstance(error, Exception):
+                    _LOGGER.warning("Error turning off mode on shutdown: %s", error)
+            if isinstance(shutdown, Exception):
+                raise shutdown
 
         await self.coordinator.async_request_refresh()
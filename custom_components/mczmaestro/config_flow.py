@@ -2,17 +2,39 @@
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+    CONF_TIMEOUT,
+)
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN
+from . import get_options
+from .const import (
+    AGGREGATE_NONE,
+    CONF_COMMAND_BURST,
+    CONF_COMMAND_RATE,
+    CONF_FAN_MIN_DELTA,
+    CONF_FUME_MIN_DELTA,
+    CONF_PUBLISH_AGGREGATE,
+    CONF_PUBLISH_MIN_INTERVAL,
+    CONF_PUBLISH_WINDOW,
+    CONF_TEMPERATURE_MIN_DELTA,
+    CONF_TRACE_BUFFER_SIZE,
+    CONF_TRACE_SAMPLE_RATE,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+)
 from .maestro import MaestroController
+from .maestro.publish import AGGREGATE_MAX, AGGREGATE_MEAN, AGGREGATE_MIN
 
 BASE_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_HOST, default="192.168.120.1"): str,
         vol.Required(CONF_PORT, default=81): int,
-        vol.Required(CONF_SCAN_INTERVAL, default=30): int,
+        vol.Required(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): int,
     }
 )
 
@@ -28,6 +50,14 @@ class MczConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Initialize class variables."""
         self.base_input = {}
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return MczOptionsFlowHandler(config_entry)
+
     async def async_step_user(self, user_input=None) -> FlowResult:
         """Handle a flow initialized by the user."""
         errors: dict[str, str] = {}
@@ -56,3 +86,103 @@ class MczConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             title=f"MCZ Maestro {controller.host}:{controller.port}",
             data=user_input,
         )
+
+
+def _can_connect(host: str, port: int) -> bool:
+    """Return true if the stove accepts a connection."""
+    try:
+        controller = MaestroController(host, port)
+    except Exception:  # pylint: disable=broad-except
+        return False
+    connected = controller.connected
+    controller.close()
+    return connected
+
+
+class MczOptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle the options, only a new host or port reconnects to the stove."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize options flow."""
+        self.config_entry = config_entry
+
+    async def async_step_init(self, user_input=None) -> FlowResult:
+        """Manage the options."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            entry = self.config_entry
+            host = user_input.pop(CONF_HOST)
+            port = user_input.pop(CONF_PORT)
+            if host == entry.data[CONF_HOST] and port == entry.data[CONF_PORT]:
+                return self.async_create_entry(title="", data=user_input)
+
+            unique_id = "_".join([DOMAIN, host, str(port)])
+            if any(
+                other.unique_id == unique_id
+                for other in self.hass.config_entries.async_entries(DOMAIN)
+                if other.entry_id != entry.entry_id
+            ):
+                errors["base"] = "already_configured"
+            elif not await self.hass.async_add_executor_job(_can_connect, host, port):
+                errors["base"] = "cannot_connect"
+            else:
+                # the update listener reloads the entry on the new host
+                self.hass.config_entries.async_update_entry(
+                    entry,
+                    title=f"MCZ Maestro {host}:{port}",
+                    unique_id=unique_id,
+                    data={**entry.data, CONF_HOST: host, CONF_PORT: port},
+                    options=user_input,
+                )
+                return self.async_create_entry(title="", data=user_input)
+
+        options = get_options(self.config_entry)
+        options_schema = vol.Schema(
+            {
+                vol.Required(CONF_HOST, default=self.config_entry.data[CONF_HOST]): str,
+                vol.Required(CONF_PORT, default=self.config_entry.data[CONF_PORT]): int,
+                vol.Required(
+                    CONF_SCAN_INTERVAL, default=options[CONF_SCAN_INTERVAL]
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Required(CONF_TIMEOUT, default=options[CONF_TIMEOUT]): vol.All(
+                    vol.Coerce(int), vol.Range(min=1)
+                ),
+                vol.Required(
+                    CONF_COMMAND_RATE, default=options[CONF_COMMAND_RATE]
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.01)),
+                vol.Required(
+                    CONF_COMMAND_BURST, default=options[CONF_COMMAND_BURST]
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                vol.Required(
+                    CONF_TEMPERATURE_MIN_DELTA,
+                    default=options[CONF_TEMPERATURE_MIN_DELTA],
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required(
+                    CONF_FUME_MIN_DELTA, default=options[CONF_FUME_MIN_DELTA]
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required(
+                    CONF_FAN_MIN_DELTA, default=options[CONF_FAN_MIN_DELTA]
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Required(
+                    CONF_PUBLISH_MIN_INTERVAL,
+                    default=options[CONF_PUBLISH_MIN_INTERVAL],
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                vol.Required(
+                    CONF_PUBLISH_WINDOW, default=options[CONF_PUBLISH_WINDOW]
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+                vol.Required(
+                    CONF_PUBLISH_AGGREGATE, default=options[CONF_PUBLISH_AGGREGATE]
+                ): vol.In(
+                    [AGGREGATE_NONE, AGGREGATE_MEAN, AGGREGATE_MIN, AGGREGATE_MAX]
+                ),
+                vol.Required(
+                    CONF_TRACE_SAMPLE_RATE, default=options[CONF_TRACE_SAMPLE_RATE]
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+                vol.Required(
+                    CONF_TRACE_BUFFER_SIZE, default=options[CONF_TRACE_BUFFER_SIZE]
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=10000)),
+            }
+        )
+        return self.async_show_form(
+            step_id="init", data_schema=options_schema, errors=errors
+        )
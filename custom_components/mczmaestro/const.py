@@ -4,4 +4,35 @@ DOMAIN = "mczmaestro"
 CONTROLLER = "controller"
 COORDINATOR = "coordinator"
 PLATFORMS = ["sensor", "switch", "climate", "number"]
+SCHEDULER = "scheduler"
+PUBLISHER = "publisher"
+TRACER = "tracer"
 UNDO_UPDATE_LISTENER = "undo_update_listener"
+
+CONF_COMMAND_RATE = "command_rate"
+CONF_COMMAND_BURST = "command_burst"
+CONF_TEMPERATURE_MIN_DELTA = "temperature_min_delta"
+CONF_FUME_MIN_DELTA = "fume_min_delta"
+CONF_FAN_MIN_DELTA = "fan_min_delta"
+CONF_PUBLISH_MIN_INTERVAL = "publish_min_interval"
+CONF_PUBLISH_WINDOW = "publish_window"
+CONF_PUBLISH_AGGREGATE = "publish_aggregate"
+CONF_TRACE_SAMPLE_RATE = "trace_sample_rate"
+CONF_TRACE_BUFFER_SIZE = "trace_buffer_size"
+
+AGGREGATE_NONE = "none"
+
+DEFAULT_SCAN_INTERVAL = 30
+
+SERVICE_COMPUTE_ANALYTICS = "compute_analytics"
+EVENT_ANALYTICS = f"{DOMAIN}_analytics"
+SERVICE_DUMP_TRACES = "dump_traces"
+EVENT_TRACES = f"{DOMAIN}_traces"
+ATTR_ENTRY_ID = "entry_id"
+ATTR_DAYS = "days"
+ATTR_CLEAR = "clear"
+ATTR_TRACES = "traces"
+ATTR_PELLET_KG_PER_REVOLUTION = "pellet_kg_per_revolution"
+ATTR_PELLET_KWH_PER_KG = "pellet_kwh_per_kg"
+ATTR_FLUE_LOSS_PER_KELVIN = "flue_loss_per_kelvin"
+ATTR_MAX_SAMPLE_GAP = "max_sample_gap"
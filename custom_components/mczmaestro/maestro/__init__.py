@@ -6,11 +6,13 @@ import logging
 
 _LOGGER = logging.getLogger(__name__)
 
+DEFAULT_TIMEOUT = 60
+
 
 class MaestroController:
     """Control the MCZ."""
 
-    def __init__(self, host: str, port: int, timeout: int = 60) -> None:
+    def __init__(self, host: str, port: int, timeout: int = DEFAULT_TIMEOUT) -> None:
         """Init the MCZ."""
         self._host = host
         self._port = str(port)
@@ -33,14 +35,25 @@ class MaestroController:
         """Return true if connected to the ws server."""
         return self._server.connected
 
+    def set_timeout(self, timeout: int) -> None:
+        """Change the timeout of the socket operations."""
+        self._server.settimeout(timeout)
+
     def send(self, message) -> None:
         """Send a message."""
         self._server.send(message)
 
+    def receive_raw(self) -> str:
+        """Get the raw message."""
+        return self._server.recv()
+
     def receive(self) -> dict:
         """Get data."""
-        data = self._server.recv()
-        return process_infostring(data)
+        return process_infostring(self.receive_raw())
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._server.close()
 
 
 class MaestroStoveState:
@@ -245,7 +258,6 @@ def get_maestro_power_state(stateid: int) -> bool:
 def process_infostring(message: str) -> dict:
     """Convert info message."""
     result = {}
-    _LOGGER.debug("message to process : %s", message)
     index = 0
     for value in message.split("|"):
         info = get_maestro_info(index)
@@ -272,5 +284,4 @@ def process_infostring(message: str) -> dict:
 
         index += 1
 
-    _LOGGER.debug("message proceed to : %s", result)
     return result
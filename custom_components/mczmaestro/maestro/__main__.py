@@ -0,0 +1,178 @@
+"""Poll MCZ Maestro stoves from the command line.
+
+Frames, errors and a final per-stove summary are written to stdout as JSON lines.
+"""
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import json
+import logging
+import sys
+import time
+
+from . import MaestroController
+
+DEFAULT_PORT = 81
+
+
+class StovePoller:
+    """Poll one stove and keep its statistics."""
+
+    def __init__(self, target: str, timeout: float) -> None:
+        """Init the poller."""
+        host, _, port = target.partition(":")
+        self.host = host
+        self.port = int(port or DEFAULT_PORT)
+        self.target = f"{self.host}:{self.port}"
+        self._timeout = timeout
+        self._controller: MaestroController | None = None
+        self.latencies: list[float] = []
+        self.errors = 0
+
+    def poll(self) -> dict:
+        """Request and decode one info frame, (re)connecting if needed."""
+        if self._controller is None or not self._controller.connected:
+            self._controller = MaestroController(self.host, self.port, self._timeout)
+        start = time.perf_counter()
+        self._controller.send("C|RecuperoInfo")
+        data = self._controller.receive()
+        self.latencies.append((time.perf_counter() - start) * 1000)
+        return data
+
+    def reset(self) -> None:
+        """Drop the connection after an error."""
+        if self._controller is not None:
+            try:
+                self._controller.close()
+            except Exception:  # pylint: disable=broad-except
+                pass
+        self._controller = None
+
+    def summary(self) -> dict:
+        """Return the poll statistics."""
+        latencies = sorted(self.latencies)
+        return {
+            "type": "summary",
+            "target": self.target,
+            "polls": len(latencies) + self.errors,
+            "errors": self.errors,
+            "latency_ms": {
+                "min": percentile(latencies, 0),
+                "p50": percentile(latencies, 50),
+                "p90": percentile(latencies, 90),
+                "p99": percentile(latencies, 99),
+                "max": percentile(latencies, 100),
+            },
+        }
+
+
+def percentile(values: list[float], rank: float) -> float | None:
+    """Return the nearest-rank percentile of sorted values."""
+    if not values:
+        return None
+    index = max(0, int(-(-rank * len(values) // 100)) - 1)
+    return round(values[min(index, len(values) - 1)], 2)
+
+
+def emit(record: dict) -> None:
+    """Write a JSON line to stdout."""
+    sys.stdout.write(json.dumps(record) + "\n")
+    sys.stdout.flush()
+
+
+async def async_poll_stove(
+    poller: StovePoller,
+    executor: ThreadPoolExecutor,
+    interval: float,
+    count: int,
+    frames: bool,
+) -> None:
+    """Poll a stove every interval, count times or forever if count is 0."""
+    loop = asyncio.get_running_loop()
+    done = 0
+    while count == 0 or done < count:
+        started = loop.time()
+        now = datetime.now(timezone.utc).isoformat()
+        try:
+            data = await loop.run_in_executor(executor, poller.poll)
+        except Exception as err:  # pylint: disable=broad-except
+            poller.errors += 1
+            await loop.run_in_executor(executor, poller.reset)
+            emit(
+                {
+                    "type": "error",
+                    "target": poller.target,
+                    "time": now,
+                    "error": f"{type(err).__name__}: {err}",
+                }
+            )
+        else:
+            if frames:
+                emit(
+                    {
+                        "type": "frame",
+                        "target": poller.target,
+                        "time": now,
+                        "latency_ms": round(poller.latencies[-1], 2),
+                        "data": data,
+                    }
+                )
+        done += 1
+        if count == 0 or done < count:
+            await asyncio.sleep(max(0, interval - (loop.time() - started)))
+    await loop.run_in_executor(executor, poller.reset)
+
+
+async def async_main(args: argparse.Namespace) -> None:
+    """Poll all the stoves concurrently, then print their summary."""
+    pollers = [StovePoller(target, args.timeout) for target in args.targets]
+    with ThreadPoolExecutor(max_workers=len(pollers)) as executor:
+        try:
+            await asyncio.gather(
+                *(
+                    async_poll_stove(
+                        poller, executor, args.interval, args.count, not args.quiet
+                    )
+                    for poller in pollers
+                )
+            )
+        finally:
+            for poller in pollers:
+                emit(poller.summary())
+
+
+def main() -> None:
+    """Parse the arguments and run."""
+    parser = argparse.ArgumentParser(
+        prog="maestro", description="Poll MCZ Maestro stoves."
+    )
+    parser.add_argument(
+        "targets", nargs="+", metavar="host[:port]", help="stoves to poll"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=5, help="seconds between polls"
+    )
+    parser.add_argument(
+        "--count", type=int, default=10, help="polls per stove, 0 for no limit"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=10, help="connection timeout in seconds"
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="only write errors and the summary"
+    )
+    parser.add_argument("--debug", action="store_true", help="enable debug logs")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        stream=sys.stderr, level=logging.DEBUG if args.debug else logging.WARNING
+    )
+    try:
+        asyncio.run(async_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
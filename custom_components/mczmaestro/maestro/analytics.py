@@ -0,0 +1,79 @@
+"""MCZ Maestro heat output and pellet consumption estimates."""
+import numpy as np
+
+DEFAULT_PELLET_KG_PER_REVOLUTION = 0.0015
+DEFAULT_PELLET_KWH_PER_KG = 4.8
+DEFAULT_FLUE_LOSS_PER_KELVIN = 0.0007
+DEFAULT_MAX_SAMPLE_GAP = 21600
+
+ANALYTICS_FIELDS = [
+    "Power_Level",
+    "RPM_WormWheel_Live",
+    "Fume_Temperature",
+    "Ambient_Temperature",
+]
+
+
+class AnalyticsCalibration:
+    """Calibration constants of the heat and pellet estimates."""
+
+    def __init__(
+        self,
+        pellet_kg_per_revolution: float = DEFAULT_PELLET_KG_PER_REVOLUTION,
+        pellet_kwh_per_kg: float = DEFAULT_PELLET_KWH_PER_KG,
+        flue_loss_per_kelvin: float = DEFAULT_FLUE_LOSS_PER_KELVIN,
+        max_sample_gap: float = DEFAULT_MAX_SAMPLE_GAP,
+    ):
+        """Init the calibration."""
+        self.pellet_kg_per_revolution = pellet_kg_per_revolution  # auger feed
+        self.pellet_kwh_per_kg = pellet_kwh_per_kg  # pellet heating value
+        self.flue_loss_per_kelvin = flue_loss_per_kelvin  # loss per fume-room K
+        self.max_sample_gap = max_sample_gap  # seconds a sample is trusted
+
+
+def compute_daily_analytics(
+    timestamps: np.ndarray,
+    samples: dict[str, np.ndarray],
+    day_bounds: np.ndarray,
+    calibration: AnalyticsCalibration,
+) -> dict[str, np.ndarray]:
+    """Aggregate samples into per-day heat output and pellet mass.
+
+    Each sample holds until the next one, up to the maximum sample gap.
+    An interval is accounted to the day its sample was taken.
+    `day_bounds` holds the n + 1 epoch boundaries of the n days.
+    """
+    days = len(day_bounds) - 1
+    duration = np.diff(timestamps, append=day_bounds[-1])
+    duration = np.clip(duration, 0, calibration.max_sample_gap)
+
+    power_level = np.nan_to_num(samples["Power_Level"])
+    rpm = np.nan_to_num(samples["RPM_WormWheel_Live"])
+    delta_temp = np.nan_to_num(
+        samples["Fume_Temperature"] - samples["Ambient_Temperature"]
+    )
+
+    burning = (power_level > 0) & (rpm > 0)
+    burn_seconds = np.where(burning, duration, 0.0)
+    pellet_kg = burn_seconds / 60 * rpm * calibration.pellet_kg_per_revolution
+    efficiency = np.clip(1 - calibration.flue_loss_per_kelvin * delta_temp, 0, 1)
+    heat_kwh = pellet_kg * calibration.pellet_kwh_per_kg * efficiency
+
+    day = np.searchsorted(day_bounds, timestamps, side="right") - 1
+    valid = (day >= 0) & (day < days)
+    day = day[valid]
+
+    def per_day(values: np.ndarray) -> np.ndarray:
+        return np.bincount(day, weights=values[valid], minlength=days)
+
+    burn_total = per_day(burn_seconds)
+    power_total = per_day(burn_seconds * power_level)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_power_level = np.where(burn_total > 0, power_total / burn_total, 0.0)
+
+    return {
+        "pellet_kg": per_day(pellet_kg),
+        "heat_kwh": per_day(heat_kwh),
+        "burn_hours": burn_total / 3600,
+        "mean_power_level": mean_power_level,
+    }
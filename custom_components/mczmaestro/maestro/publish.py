@@ -0,0 +1,147 @@
+"""MCZ Maestro publishing policies."""
+from collections import deque
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+AGGREGATE_MEAN = "mean"
+AGGREGATE_MIN = "min"
+AGGREGATE_MAX = "max"
+
+AGGREGATES = {
+    AGGREGATE_MEAN: lambda values: sum(values) / len(values),
+    AGGREGATE_MIN: min,
+    AGGREGATE_MAX: max,
+}
+
+
+class PublishPolicy:
+    """How often a numeric field is published."""
+
+    def __init__(
+        self,
+        min_delta: float = 0,
+        min_interval: float = 0,
+        window: int = 0,
+        aggregate: str | None = None,
+    ):
+        """Init a new policy."""
+        self.min_delta = min_delta  # Smallest change published
+        self.min_interval = min_interval  # Seconds between two publications
+        self.window = window  # Samples kept for the aggregate
+        self.aggregate = aggregate  # Published aggregate of the window
+
+
+TEMPERATURE_FIELDS = [
+    "Ambient_Temperature",
+    "Puffer_Temperature",
+    "Boiler_Temperature",
+    "NTC3_Temperature",
+    "Temperature_Motherboard",
+    "Return_Temperature",
+]
+
+# fields changing while the stove runs, published at most once per interval
+RATE_LIMITED_FIELDS = [
+    "RPM_WormWheel_Set",
+    "RPM_WormWheel_Live",
+    "Pump_PWM",
+    "Minutes_To_Switch_Off",
+]
+
+DEFAULT_TEMPERATURE_MIN_DELTA = 0.5
+DEFAULT_FUME_MIN_DELTA = 2.0
+DEFAULT_FAN_MIN_DELTA = 50
+DEFAULT_MIN_INTERVAL = 60
+DEFAULT_WINDOW = 4
+DEFAULT_AGGREGATE = AGGREGATE_MEAN
+
+
+def build_publish_policies(
+    temperature_min_delta: float = DEFAULT_TEMPERATURE_MIN_DELTA,
+    fume_min_delta: float = DEFAULT_FUME_MIN_DELTA,
+    fan_min_delta: float = DEFAULT_FAN_MIN_DELTA,
+    min_interval: float = DEFAULT_MIN_INTERVAL,
+    window: int = DEFAULT_WINDOW,
+    aggregate: str | None = DEFAULT_AGGREGATE,
+) -> dict[str, PublishPolicy]:
+    """Return the policies of the fields, the fume ones being aggregated."""
+    temperature = PublishPolicy(
+        min_delta=temperature_min_delta, min_interval=min_interval
+    )
+    rate_limited = PublishPolicy(min_interval=min_interval)
+    return {
+        "Fume_Temperature": PublishPolicy(
+            fume_min_delta, min_interval, window, aggregate
+        ),
+        "RPM_Fam_Fume": PublishPolicy(fan_min_delta, min_interval, window, aggregate),
+        **{field: temperature for field in TEMPERATURE_FIELDS},
+        **{field: rate_limited for field in RATE_LIMITED_FIELDS},
+    }
+
+
+class FieldPublisher:
+    """Publication state of one field."""
+
+    def __init__(self, policy: PublishPolicy):
+        """Init the field state."""
+        self.policy = policy
+        self.samples: deque[float] = deque(maxlen=max(policy.window, 1))
+        self.value: float | None = None
+        self.published: str | None = None
+        self.published_at = 0.0
+
+    def process(self, raw: str, now: float) -> str:
+        """Add a sample and return the value to publish."""
+        try:
+            sample = float(raw)
+        except ValueError:
+            return raw
+        self.samples.append(sample)
+
+        value = sample
+        published = raw
+        if self.policy.aggregate in AGGREGATES:
+            value = AGGREGATES[self.policy.aggregate](self.samples)
+            published = str(round(value, 1)) if "." in raw else str(round(value))
+
+        if (
+            self.value is None
+            or abs(value - self.value) >= self.policy.min_delta
+            and now - self.published_at >= self.policy.min_interval
+        ):
+            self.value = value
+            self.published = published
+            self.published_at = now
+        return self.published
+
+
+class MaestroPublisher:
+    """Hold back small or too frequent changes of the numeric fields."""
+
+    def __init__(self, policies: dict[str, PublishPolicy] | None = None) -> None:
+        """Init the publisher."""
+        self._fields: dict[str, FieldPublisher] = {}
+        self.configure(build_publish_policies() if policies is None else policies)
+
+    def configure(self, policies: dict[str, PublishPolicy]) -> None:
+        """Change the policies, the samples of unchanged windows are kept."""
+        fields = {}
+        for name, policy in policies.items():
+            field = self._fields.get(name)
+            if field is None or field.samples.maxlen != max(policy.window, 1):
+                field = FieldPublisher(policy)
+            field.policy = policy
+            fields[name] = field
+        self._fields = fields
+
+    def process(self, data: dict, now: float | None = None) -> dict:
+        """Return the data to publish from a decoded frame."""
+        if now is None:
+            now = time.monotonic()
+        result = dict(data)
+        for name, field in self._fields.items():
+            if name in result:
+                result[name] = field.process(result[name], now)
+        return result
@@ -0,0 +1,246 @@
+"""MCZ Maestro command scheduler."""
+import asyncio
+from collections.abc import Callable
+import itertools
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+PRIORITY_CRITICAL = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+# WriteParametri ids that must never wait behind regular commands
+CRITICAL_PARAMETERS = [
+    1,  # alarm reset
+    34,  # power on / power off
+]
+
+DEFAULT_RATE = 0.5
+DEFAULT_BURST = 3
+DEFAULT_MAX_QUEUE = 20
+
+
+class MaestroCommandError(Exception):
+    """Raised when a command could not be sent."""
+
+
+class MaestroCommandRejected(MaestroCommandError):
+    """Raised when a command can not be queued."""
+
+
+def get_command_priority(message: str) -> int:
+    """Return the priority class of a command."""
+    parts = message.split("|")
+    if len(parts) >= 3 and parts[1] == "WriteParametri":
+        try:
+            parameter = int(parts[2])
+        except ValueError:
+            return PRIORITY_NORMAL
+        if parameter in CRITICAL_PARAMETERS:
+            return PRIORITY_CRITICAL
+        return PRIORITY_NORMAL
+    return PRIORITY_LOW
+
+
+def get_command_key(message: str) -> str:
+    """Return the key used to coalesce pending writes to the same parameter."""
+    parts = message.split("|")
+    if len(parts) >= 3 and parts[1] == "WriteParametri":
+        return parts[2]
+    return message
+
+
+class TokenBucket:
+    """Token bucket limiting sustained and burst rates."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Init the bucket, full."""
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+
+    def configure(self, rate: float, burst: int) -> None:
+        """Change the rate and burst of the bucket."""
+        self._refill()
+        self._rate = rate
+        self._burst = burst
+        self._tokens = min(self._tokens, float(burst))
+
+    def _refill(self) -> None:
+        """Add the tokens earned since last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            float(self._burst), self._tokens + (now - self._last) * self._rate
+        )
+        self._last = now
+
+    def consume(self) -> float:
+        """Take a token, return the seconds to wait if none is available."""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self._rate
+
+
+class PendingCommand:
+    """Command waiting to be sent, and the callers waiting for it."""
+
+    def __init__(self, priority: int, order: int, message: str) -> None:
+        """Init a pending command."""
+        self.priority = priority
+        self.order = order
+        self.message = message
+        self.waiters: list[asyncio.Future] = []
+        self.delayed = False  # waited for a token at least once
+
+
+class MaestroCommandScheduler:
+    """Send commands to the stove by priority, within a rate limit."""
+
+    def __init__(
+        self,
+        send: Callable[[str], None],
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+    ) -> None:
+        """Init the scheduler."""
+        self._send = send
+        self._bucket = TokenBucket(rate, burst)
+        self._max_queue = max_queue
+        self._pending: dict[str, PendingCommand] = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._waiting = False
+        self.peak_queue_depth = 0  # highest depth since the last reset
+        self.sent = 0
+        self.delayed = 0
+        self.rejected = 0
+        self.coalesced = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of commands waiting to be sent."""
+        return len(self._pending)
+
+    @property
+    def metrics(self) -> dict:
+        """Return the scheduler metrics."""
+        return {
+            "queue_depth": self.queue_depth,
+            "peak_queue_depth": self.peak_queue_depth,
+            "sent": self.sent,
+            "delayed": self.delayed,
+            "rejected": self.rejected,
+            "coalesced": self.coalesced,
+        }
+
+    def configure(self, rate: float, burst: int) -> None:
+        """Change the rate limit."""
+        self._bucket.configure(rate, burst)
+
+    def reset_peak_queue_depth(self) -> int:
+        """Return the peak depth and restart it from the current depth."""
+        peak = self.peak_queue_depth
+        self.peak_queue_depth = self.queue_depth
+        return peak
+
+    async def async_send(self, message: str, priority: int | None = None) -> None:
+        """Send a command, the most urgent commands are sent first.
+
+        Return once the command has been sent to the stove.
+        """
+        if priority is None:
+            priority = get_command_priority(message)
+        key = get_command_key(message)
+
+        command = self._pending.get(key)
+        if command is not None:
+            # a newer value for the same parameter replaces the pending one
+            command.message = message
+            command.priority = min(command.priority, priority)
+            self.coalesced += 1
+        else:
+            if priority != PRIORITY_CRITICAL and len(self._pending) >= self._max_queue:
+                self.rejected += 1
+                _LOGGER.warning("Command queue full, %s rejected", message)
+                raise MaestroCommandRejected(f"Command queue full, {message} rejected")
+            command = PendingCommand(priority, next(self._counter), message)
+            command.delayed = self._waiting
+            self._pending[key] = command
+            self.peak_queue_depth = max(self.peak_queue_depth, len(self._pending))
+
+        waiter = asyncio.get_running_loop().create_future()
+        command.waiters.append(waiter)
+
+        self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._async_run())
+
+        await waiter
+
+    async def async_stop(self) -> None:
+        """Stop sending, pending commands are dropped."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for command in self._pending.values():
+            for waiter in command.waiters:
+                if not waiter.done():
+                    waiter.set_exception(
+                        MaestroCommandError(f"{command.message} dropped on stop")
+                    )
+        self._pending.clear()
+
+    def _pop(self) -> PendingCommand:
+        """Remove and return the most urgent pending command."""
+        key = min(
+            self._pending,
+            key=lambda k: (self._pending[k].priority, self._pending[k].order),
+        )
+        return self._pending.pop(key)
+
+    async def _async_run(self) -> None:
+        """Send pending commands while tokens are available."""
+        while True:
+            if not self._pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            wait = self._bucket.consume()
+            while wait > 0:
+                # every command pending or queued meanwhile is delayed
+                self._waiting = True
+                for command in self._pending.values():
+                    command.delayed = True
+                await asyncio.sleep(wait)
+                wait = self._bucket.consume()
+            self._waiting = False
+
+            # pick after waiting, a more urgent command may have been queued
+            command = self._pop()
+            if command.delayed:
+                self.delayed += 1
+            try:
+                self._send(command.message)
+            except Exception as err:  # pylint: disable=broad-except
+                _LOGGER.error("Error sending %s: %s", command.message, err)
+                error = MaestroCommandError(f"Error sending {command.message}: {err}")
+                for waiter in command.waiters:
+                    if not waiter.done():
+                        waiter.set_exception(error)
+            else:
+                self.sent += 1
+                for waiter in command.waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
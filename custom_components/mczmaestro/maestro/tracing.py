@@ -0,0 +1,110 @@
+"""MCZ Maestro sampled tracing."""
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import logging
+import random
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SAMPLE_RATE = 0.0
+DEFAULT_BUFFER_SIZE = 100
+
+
+class Trace:
+    """Timings and messages of one sampled operation."""
+
+    def __init__(self, name: str) -> None:
+        """Init a new trace."""
+        self.name = name
+        self.started = time.time()
+        self.spans: list[tuple[str, float]] = []
+        self.messages: list[tuple] = []
+        self.error: str | None = None
+
+    @contextmanager
+    def span(self, name: str):
+        """Time the wrapped block."""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as err:
+            self.error = f"{name}: {type(err).__name__}: {err}"
+            raise
+        finally:
+            self.spans.append((name, (time.perf_counter() - start) * 1000))
+
+    def log(self, message: str, *args) -> None:
+        """Keep a message, formatted only when the trace is read."""
+        self.messages.append((message, args))
+
+    def as_dict(self) -> dict:
+        """Return the trace with its messages formatted."""
+        return {
+            "name": self.name,
+            "time": datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+            "spans_ms": {name: round(duration, 3) for name, duration in self.spans},
+            "messages": [message % args for message, args in self.messages],
+            "error": self.error,
+        }
+
+    def __str__(self) -> str:
+        """Return the trace as text, for lazy logging."""
+        return str(self.as_dict())
+
+
+class NoTrace:
+    """Trace of an operation not sampled, does nothing."""
+
+    error = None
+
+    @contextmanager
+    def span(self, name: str):
+        """Run the wrapped block untimed."""
+        yield
+
+    def log(self, message: str, *args) -> None:
+        """Ignore the message."""
+
+
+NO_TRACE = NoTrace()
+
+
+class MaestroTracer:
+    """Sample operations and keep the last traces in a bounded buffer."""
+
+    def __init__(
+        self,
+        sample_rate: float = DEFAULT_SAMPLE_RATE,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        """Init the tracer."""
+        self._sample_rate = sample_rate
+        self._buffer: deque[Trace] = deque(maxlen=buffer_size)
+
+    def configure(self, sample_rate: float, buffer_size: int) -> None:
+        """Change the sample rate and the buffer size, keeping the last traces."""
+        self._sample_rate = sample_rate
+        if buffer_size != self._buffer.maxlen:
+            self._buffer = deque(self._buffer, maxlen=buffer_size)
+
+    def trace(self, name: str) -> Trace | NoTrace:
+        """Start a trace if the operation is sampled."""
+        if self._sample_rate > 0 and random.random() < self._sample_rate:
+            return Trace(name)
+        return NO_TRACE
+
+    def record(self, trace: Trace | NoTrace) -> None:
+        """Keep a finished trace."""
+        if trace is NO_TRACE:
+            return
+        self._buffer.append(trace)
+        _LOGGER.debug("Trace %s", trace)
+
+    def dump(self, clear: bool = False) -> list[dict]:
+        """Return the buffered traces, oldest first."""
+        traces = [trace.as_dict() for trace in self._buffer]
+        if clear:
+            self._buffer.clear()
+        return traces
@@ -9,7 +9,7 @@ from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import MczEntity
-from .const import CONTROLLER, COORDINATOR, DOMAIN
+from .const import CONTROLLER, COORDINATOR, DOMAIN, SCHEDULER
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,16 +23,17 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][config_entry.entry_id]
     controller = data[CONTROLLER]
     coordinator = data[COORDINATOR]
+    scheduler = data[SCHEDULER]
 
     entities = [
         MczNumberEntity(
-            controller, coordinator, "Temperature T1", "Chronostat_T1", 1108
+            controller, scheduler, coordinator, "Temperature T1", "Chronostat_T1", 1108
         ),
         MczNumberEntity(
-            controller, coordinator, "Temperature T2", "Chronostat_T2", 1109
+            controller, scheduler, coordinator, "Temperature T2", "Chronostat_T2", 1109
         ),
         MczNumberEntity(
-            controller, coordinator, "Temperature T3", "Chronostat_T3", 1110
+            controller, scheduler, coordinator, "Temperature T3", "Chronostat_T3", 1110
         ),
     ]
 
@@ -49,9 +50,11 @@ class MczNumberEntity(MczEntity, NumberEntity):
     _attr_device_class = NumberDeviceClass.TEMPERATURE
     _attr_entity_category = EntityCategory.CONFIG
 
-    def __init__(self, controller, coordinator, name, command_name, command_id):
+    def __init__(
+        self, controller, scheduler, coordinator, name, command_name, command_id
+    ):
         """Initialize the sensor."""
-        super().__init__(controller, coordinator, name, command_name)
+        super().__init__(controller, scheduler, coordinator, name, command_name)
         self._command_id = command_id
         self._value = 0
 
@@ -62,7 +65,7 @@ class MczNumberEntity(MczEntity, NumberEntity):
 
     async def async_set_native_value(self, value: float) -> None:
         """Update the current value."""
-        self.controller.send(f"C|WriteParametri|{self._command_id}|{value}")
+        await self.async_send_command(f"C|WriteParametri|{self._command_id}|{value}")
         # set value in local if it's not return by the strove
         self._value = value
         await self.coordinator.async_request_refresh()
@@ -3,19 +3,40 @@ from collections.abc import Mapping
 import logging
 from typing import Any
 
-from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import TEMP_CELSIUS
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import MczEntity
-from .const import CONTROLLER, COORDINATOR, DOMAIN
+from .const import CONTROLLER, COORDINATOR, DOMAIN, SCHEDULER
 from .maestro import MaestroController, get_maestro_state_description
+from .maestro.scheduler import MaestroCommandScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
+# counters changing on every frame, left out of the state attributes so the
+# recorder only gets a row when a published value changes
+STATE_EXCLUDED_ATTRIBUTES = [
+    "Date_Time_Hours",
+    "Date_Time_Minutes",
+    "Date_Day_Of_Month",
+    "Date_Month",
+    "Date_Year",
+    "Total_Operating_Hours",
+    "Hours_Of_Operation_In_Power1",
+    "Hours_Of_Operation_In_Power2",
+    "Hours_Of_Operation_In_Power3",
+    "Hours_Of_Operation_In_Power4",
+    "Hours_Of_Operation_In_Power5",
+]
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -26,17 +47,45 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][config_entry.entry_id]
     controller = data[CONTROLLER]
     coordinator = data[COORDINATOR]
+    scheduler = data[SCHEDULER]
 
     entities = [
-        MczStateEntity(controller, coordinator, name="State", command_name="state"),
+        MczStateEntity(
+            controller, scheduler, coordinator, name="State", command_name="state"
+        ),
         MczSensorEntity(
             controller,
+            scheduler,
             coordinator,
             "Temperature",
             "Ambient_Temperature",
             device_class=SensorDeviceClass.TEMPERATURE,
             unit_of_measurement=TEMP_CELSIUS,
         ),
+        MczQueueDepthSensorEntity(
+            controller,
+            scheduler,
+            coordinator,
+            "Command queue depth",
+            "queue_depth",
+            state_class=SensorStateClass.MEASUREMENT,
+        ),
+        MczSchedulerSensorEntity(
+            controller,
+            scheduler,
+            coordinator,
+            "Commands delayed",
+            "delayed",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+        ),
+        MczSchedulerSensorEntity(
+            controller,
+            scheduler,
+            coordinator,
+            "Commands rejected",
+            "rejected",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+        ),
     ]
 
     if entities:
@@ -51,8 +100,6 @@ class MczStateEntity(MczEntity, SensorEntity):
     @property
     def native_value(self) -> str:
         """Return the state."""
-        _LOGGER.debug("State entity debug")
-        _LOGGER.debug(self.coordinator.data)
         if "Stove_State" in self.coordinator.data:
             return get_maestro_state_description(
                 int(self.coordinator.data["Stove_State"])
@@ -63,7 +110,11 @@ class MczStateEntity(MczEntity, SensorEntity):
     def extra_state_attributes(self) -> Mapping[str, Any]:
         """Return the state attributes."""
         if self.coordinator.data:
-            return self.coordinator.data
+            return {
+                name: value
+                for name, value in self.coordinator.data.items()
+                if name not in STATE_EXCLUDED_ATTRIBUTES
+            }
         return {}
 
 
@@ -73,6 +124,7 @@ class MczSensorEntity(MczEntity, SensorEntity):
     def __init__(
         self,
         controller: MaestroController,
+        scheduler: MaestroCommandScheduler,
         coordinator,
         name,
         command_name,
@@ -80,7 +132,7 @@ class MczSensorEntity(MczEntity, SensorEntity):
         unit_of_measurement: str,
     ):
         """Initialize the sensor."""
-        super().__init__(controller, coordinator, name, command_name)
+        super().__init__(controller, scheduler, coordinator, name, command_name)
         self._attr_device_class = device_class
         self._attr_native_unit_of_measurement = unit_of_measurement
 
@@ -88,3 +140,50 @@ class MczSensorEntity(MczEntity, SensorEntity):
     def native_value(self) -> float:
         """Return the state."""
         return self.coordinator.data[self._command_name]
+
+
+class MczSchedulerSensorEntity(MczEntity, SensorEntity):
+    """Representation of a MCZ command scheduler metric."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        controller: MaestroController,
+        scheduler: MaestroCommandScheduler,
+        coordinator,
+        name,
+        command_name,
+        state_class: SensorStateClass,
+    ):
+        """Initialize the sensor."""
+        super().__init__(controller, scheduler, coordinator, name, command_name)
+        self._attr_state_class = state_class
+
+    @property
+    def native_value(self) -> int:
+        """Return the metric value."""
+        return self.scheduler.metrics[self._command_name]
+
+
+class MczQueueDepthSensorEntity(MczSchedulerSensorEntity):
+    """Representation of the peak command queue depth between two updates.
+
+    The queue fills and drains between polls, the depth at poll time misses
+    the bursts.
+    """
+
+    _peak: int | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Take the peak depth since the previous update."""
+        self._peak = self.scheduler.reset_peak_queue_depth()
+        super()._handle_coordinator_update()
+
+    @property
+    def native_value(self) -> int:
+        """Return the peak depth."""
+        if self._peak is None:
+            return self.scheduler.queue_depth
+        return self._peak
@@ -8,7 +8,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import MczEntity
-from .const import CONTROLLER, COORDINATOR, DOMAIN
+from .const import CONTROLLER, COORDINATOR, DOMAIN, SCHEDULER
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,13 +22,22 @@ async def async_setup_entry(
     data = hass.data[DOMAIN][config_entry.entry_id]
     controller = data[CONTROLLER]
     coordinator = data[COORDINATOR]
+    scheduler = data[SCHEDULER]
 
     entities = [
-        MczSwitchEntity(controller, coordinator, "Mode Eco", "Eco_Mode", 41),
-        MczSwitchEntity(controller, coordinator, "Mode Silencieux", "Silent_Mode", 45),
-        MczSwitchEntity(controller, coordinator, "Mode Actif", "Active_Mode", 35),
-        MczSwitchEntity(controller, coordinator, "Mode Dynamique", "Control_Mode", 40),
-        MczSwitchEntity(controller, coordinator, "Mode Chrono", "Chronostat", 1111),
+        MczSwitchEntity(controller, scheduler, coordinator, "Mode Eco", "Eco_Mode", 41),
+        MczSwitchEntity(
+            controller, scheduler, coordinator, "Mode Silencieux", "Silent_Mode", 45
+        ),
+        MczSwitchEntity(
+            controller, scheduler, coordinator, "Mode Actif", "Active_Mode", 35
+        ),
+        MczSwitchEntity(
+            controller, scheduler, coordinator, "Mode Dynamique", "Control_Mode", 40
+        ),
+        MczSwitchEntity(
+            controller, scheduler, coordinator, "Mode Chrono", "Chronostat", 1111
+        ),
     ]
     if entities:
         async_add_entities(entities)
@@ -37,9 +46,11 @@ async def async_setup_entry(
 class MczSwitchEntity(MczEntity, SwitchEntity):
     """Representation of a MCZ switch."""
 
-    def __init__(self, controller, coordinator, name, command_name, command_id):
+    def __init__(
+        self, controller, scheduler, coordinator, name, command_name, command_id
+    ):
         """Initialize the sensor."""
-        super().__init__(controller, coordinator, name, command_name)
+        super().__init__(controller, scheduler, coordinator, name, command_name)
         self._command_id = command_id
 
     @property
@@ -49,10 +60,10 @@ class MczSwitchEntity(MczEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
-        self.controller.send(f"C|WriteParametri|{self._command_id}|1")
+        await self.async_send_command(f"C|WriteParametri|{self._command_id}|1")
         await self.coordinator.async_request_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the switch."""
-        self.controller.send(f"C|WriteParametri|{self._command_id}|0")
+        await self.async_send_command(f"C|WriteParametri|{self._command_id}|0")
         await self.coordinator.async_request_refresh()
@@ -0,0 +1,7 @@
+"""Fixtures for the MCZ Maestro tests."""
+from pathlib import Path
+import sys
+
+# the maestro package does not depend on Home Assistant, import it standalone
+# like the command line does
+sys.path.insert(0, str(Path(__file__).parents[1] / "custom_components" / "mczmaestro"))
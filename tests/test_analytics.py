@@ -0,0 +1,140 @@
+"""Tests for the MCZ Maestro analytics."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("homeassistant.components.recorder")
+
+# pylint: disable=wrong-import-position
+from homeassistant.core import State  # noqa: E402
+
+from custom_components.mczmaestro import analytics  # noqa: E402
+
+ENTITY_ID = "sensor.mcz_maestro_state"
+START = datetime(2022, 11, 1, tzinfo=timezone.utc)
+END = START + timedelta(days=1)
+
+
+def _state(offset: timedelta, state: str = "Power 3", **attributes) -> State:
+    """Return a recorded state of the state sensor."""
+    updated = START + offset
+    return State(
+        ENTITY_ID,
+        state,
+        attributes,
+        last_changed=START,
+        last_updated=updated,
+    )
+
+
+def _burning(offset: timedelta, rpm: str = "20") -> State:
+    """Return a burning sample."""
+    return _state(
+        offset,
+        Power_Level="3",
+        RPM_WormWheel_Live=rpm,
+        Fume_Temperature="170",
+        Ambient_Temperature="20.0",
+    )
+
+
+def test_attribute_only_rows_are_loaded(monkeypatch):
+    """Rows where only the attributes changed are samples."""
+    rows = [
+        _burning(timedelta(hours=1)),
+        _burning(timedelta(hours=2), rpm="30"),
+        _state(timedelta(hours=3), "unavailable"),
+    ]
+    calls = []
+
+    def get_significant_states(hass, start, end, entity_ids, **kwargs):
+        calls.append(kwargs)
+        return {ENTITY_ID: rows}
+
+    monkeypatch.setattr(
+        analytics.history, "get_significant_states", get_significant_states
+    )
+
+    timestamps, samples = analytics._load_history(None, ENTITY_ID, START, END)
+
+    assert calls[0]["significant_changes_only"] is False
+    assert len(timestamps) == 3
+    np.testing.assert_array_equal(samples["RPM_WormWheel_Live"][:2], [20, 30])
+    assert np.isnan(samples["Power_Level"][2])
+
+
+def test_import_overwrites_window(monkeypatch):
+    """Days already imported are imported again, continuing the previous sum."""
+    imported = []
+
+    class Recorder:
+        async def async_add_executor_job(self, target, *args):
+            return target(*args)
+
+    def statistics_during_period(hass, start, end, ids, period, units, types):
+        assert end == START
+        return {"mczmaestro:stove_heat_output": [{"sum": 10.0}, {"sum": 12.5}]}
+
+    monkeypatch.setattr(analytics, "get_instance", lambda hass: Recorder())
+    monkeypatch.setattr(analytics, "statistics_during_period", statistics_during_period)
+    monkeypatch.setattr(
+        analytics,
+        "async_add_external_statistics",
+        lambda hass, metadata, statistics: imported.extend(statistics),
+    )
+
+    asyncio.run(
+        analytics._async_import_statistics(
+            None,
+            "mczmaestro:stove_heat_output",
+            "Stove heat output",
+            "kWh",
+            [START, END],
+            np.array([1.0, 2.0]),
+        )
+    )
+
+    assert [row["start"] for row in imported] == [START, END]
+    assert [row["sum"] for row in imported] == [13.5, 15.5]
+
+
+def test_import_aligns_starts_to_the_hour(monkeypatch):
+    """Local midnights of half-hour offsets are imported on the hour."""
+    imported = []
+    sum_before = []
+
+    class Recorder:
+        async def async_add_executor_job(self, target, *args):
+            return target(*args)
+
+    def statistics_during_period(hass, start, end, ids, period, units, types):
+        sum_before.append(end)
+        return {}
+
+    monkeypatch.setattr(analytics, "get_instance", lambda hass: Recorder())
+    monkeypatch.setattr(analytics, "statistics_during_period", statistics_during_period)
+    monkeypatch.setattr(
+        analytics,
+        "async_add_external_statistics",
+        lambda hass, metadata, statistics: imported.extend(statistics),
+    )
+
+    # midnight in UTC+05:30
+    midnight = START - timedelta(hours=5, minutes=30)
+    asyncio.run(
+        analytics._async_import_statistics(
+            None,
+            "mczmaestro:stove_heat_output",
+            "Stove heat output",
+            "kWh",
+            [midnight, midnight + timedelta(days=1)],
+            np.array([1.0, 2.0]),
+        )
+    )
+
+    hour = START - timedelta(hours=6)
+    assert sum_before == [hour]
+    assert [row["start"] for row in imported] == [hour, hour + timedelta(days=1)]
+    assert [row["sum"] for row in imported] == [1.0, 3.0]
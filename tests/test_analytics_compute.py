@@ -0,0 +1,65 @@
+"""Tests for the MCZ Maestro heat output and pellet consumption estimates."""
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# pylint: disable=wrong-import-position
+from maestro.analytics import (  # noqa: E402
+    AnalyticsCalibration,
+    compute_daily_analytics,
+)
+
+DAY = 86400
+CALIBRATION = AnalyticsCalibration(pellet_kg_per_revolution=0.001)
+
+
+def _samples(power_level, rpm, fume=170.0, ambient=20.0):
+    """Return the sample arrays of the given series."""
+    count = len(power_level)
+    return {
+        "Power_Level": np.array(power_level, dtype=float),
+        "RPM_WormWheel_Live": np.array(rpm, dtype=float),
+        "Fume_Temperature": np.full(count, fume),
+        "Ambient_Temperature": np.full(count, ambient),
+    }
+
+
+def test_burning_samples():
+    """Each sample holds until the next one, unset samples do not burn."""
+    timestamps = np.array([3600.0, 7200.0, 10800.0])
+    samples = _samples([3, 3, np.nan], [20, 30, np.nan])
+
+    result = compute_daily_analytics(
+        timestamps, samples, np.array([0.0, DAY]), CALIBRATION
+    )
+
+    assert result["burn_hours"][0] == pytest.approx(2)
+    assert result["pellet_kg"][0] == pytest.approx((20 + 30) * 60 * 0.001)
+    assert result["mean_power_level"][0] == pytest.approx(3)
+    assert result["heat_kwh"][0] == pytest.approx(
+        result["pellet_kg"][0] * 4.8 * (1 - 0.0007 * 150)
+    )
+
+
+def test_samples_split_by_day():
+    """A sample is accounted to its day, up to the maximum sample gap."""
+    timestamps = np.array([DAY - 3600.0, DAY + 3600.0, DAY + 7200.0])
+    samples = _samples([2, 4, 0], [10, 10, 0])
+    calibration = AnalyticsCalibration(max_sample_gap=1800)
+
+    result = compute_daily_analytics(
+        timestamps, samples, np.array([0.0, DAY, 2 * DAY]), calibration
+    )
+
+    np.testing.assert_allclose(result["burn_hours"], [0.5, 0.5])
+    np.testing.assert_allclose(result["mean_power_level"], [2, 4])
+
+
+def test_no_samples():
+    """Days without samples are zero."""
+    result = compute_daily_analytics(
+        np.array([]), _samples([], []), np.array([0.0, DAY, 2 * DAY]), CALIBRATION
+    )
+
+    for values in result.values():
+        np.testing.assert_array_equal(values, [0, 0])
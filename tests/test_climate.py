@@ -0,0 +1,46 @@
+"""Tests for the MCZ Maestro climate."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+pytest.importorskip("homeassistant.components.climate")
+
+# pylint: disable=wrong-import-position
+from homeassistant.components.climate import HVACMode  # noqa: E402
+
+from custom_components.mczmaestro.climate import MczClimateEntity  # noqa: E402
+from custom_components.mczmaestro.maestro.scheduler import (  # noqa: E402
+    MaestroCommandScheduler,
+)
+
+SHUTDOWN = "C|WriteParametri|34|40"
+
+
+def test_off_is_sent_through_a_flood():
+    """The shutdown is sent first even when the queue is full."""
+    sent = []
+
+    async def run():
+        scheduler = MaestroCommandScheduler(sent.append, rate=100, burst=1, max_queue=5)
+        controller = MagicMock(host="192.168.120.1", port="81")
+        coordinator = MagicMock(data={"Stove_State": 11})
+        coordinator.async_request_refresh = AsyncMock()
+        entity = MczClimateEntity(controller, scheduler, coordinator, "Stove", "stove")
+
+        flood = [
+            asyncio.create_task(scheduler.async_send(f"C|WriteParametri|{1200 + i}|1"))
+            for i in range(10)
+        ]
+        await asyncio.sleep(0)
+
+        await entity.async_set_hvac_mode(HVACMode.OFF)
+
+        coordinator.async_request_refresh.assert_awaited_once()
+        await asyncio.gather(*flood, return_exceptions=True)
+        await scheduler.async_stop()
+
+    asyncio.run(run())
+
+    # only the flood command sent before the shutdown was queued may precede it
+    assert sent.index(SHUTDOWN) <= 1
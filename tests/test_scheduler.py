@@ -0,0 +1,185 @@
+"""Tests for the MCZ Maestro command scheduler."""
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("websocket")
+
+# pylint: disable=wrong-import-position
+from maestro.scheduler import (  # noqa: E402
+    MaestroCommandError,
+    MaestroCommandRejected,
+    MaestroCommandScheduler,
+)
+
+SHUTDOWN = "C|WriteParametri|34|40"
+
+
+def _run(coro):
+    """Run a test coroutine."""
+    return asyncio.run(coro)
+
+
+def test_priority_ordering():
+    """Critical writes go first, then regular writes, then other commands."""
+    sent = []
+
+    async def run():
+        scheduler = MaestroCommandScheduler(sent.append, rate=100, burst=1)
+        await asyncio.gather(
+            scheduler.async_send("C|RecuperoInfo"),
+            scheduler.async_send("C|WriteParametri|42|3"),
+            scheduler.async_send(SHUTDOWN),
+        )
+        await scheduler.async_stop()
+
+    _run(run())
+
+    assert sent == [SHUTDOWN, "C|WriteParametri|42|3", "C|RecuperoInfo"]
+
+
+def test_critical_skips_full_queue():
+    """A full queue rejects regular commands but not critical ones."""
+    sent = []
+
+    async def run():
+        scheduler = MaestroCommandScheduler(sent.append, rate=100, burst=1, max_queue=1)
+        results = await asyncio.gather(
+            scheduler.async_send("C|WriteParametri|42|3"),
+            scheduler.async_send("C|WriteParametri|43|1"),
+            scheduler.async_send(SHUTDOWN),
+            return_exceptions=True,
+        )
+        await scheduler.async_stop()
+        return scheduler, results
+
+    scheduler, results = _run(run())
+
+    assert isinstance(results[1], MaestroCommandRejected)
+    assert results[0] is None and results[2] is None
+    assert sent == [SHUTDOWN, "C|WriteParametri|42|3"]
+    assert scheduler.rejected == 1
+
+
+def test_coalescing():
+    """Pending writes to the same parameter are sent once, with the last value."""
+    sent = []
+
+    async def run():
+        scheduler = MaestroCommandScheduler(sent.append, rate=100, burst=1)
+        await asyncio.gather(
+            scheduler.async_send("C|WriteParametri|42|1"),
+            scheduler.async_send("C|WriteParametri|42|2"),
+            scheduler.async_send("C|WriteParametri|42|3"),
+        )
+        await scheduler.async_stop()
+        return scheduler
+
+    scheduler = _run(run())
+
+    assert sent == ["C|WriteParametri|42|3"]
+    assert scheduler.coalesced == 2
+    assert scheduler.sent == 1
+
+
+def test_token_bucket_delay():
+    """Commands over the burst wait for the rate."""
+    sent = []
+
+    async def run():
+        scheduler = MaestroCommandScheduler(sent.append, rate=20, burst=1)
+        start = time.monotonic()
+        await asyncio.gather(
+            *(scheduler.async_send(f"C|WriteParametri|{40 + i}|1") for i in range(3))
+        )
+        elapsed = time.monotonic() - start
+        await scheduler.async_stop()
+        return scheduler, elapsed
+
+    scheduler, elapsed = _run(run())
+
+    assert len(sent) == 3
+    assert elapsed >= 0.09
+    assert scheduler.delayed == 2
+
+
+def test_stop_fails_waiters():
+    """Commands still pending on stop fail their callers."""
+    sent = []
+
+    async def run():
+        scheduler = MaestroCommandScheduler(sent.append, rate=0.001, burst=1)
+        first = asyncio.create_task(scheduler.async_send("C|WriteParametri|42|1"))
+        second = asyncio.create_task(scheduler.async_send("C|WriteParametri|43|1"))
+        await first
+        await scheduler.async_stop()
+        with pytest.raises(MaestroCommandError):
+            await second
+        return scheduler
+
+    scheduler = _run(run())
+
+    assert sent == ["C|WriteParametri|42|1"]
+    assert scheduler.queue_depth == 0
+
+
+def test_send_error_fails_waiter():
+    """An error sending the command is raised to the caller."""
+
+    def send(message):
+        raise ConnectionError("closed")
+
+    async def run():
+        scheduler = MaestroCommandScheduler(send, rate=100, burst=1)
+        with pytest.raises(MaestroCommandError):
+            await scheduler.async_send(SHUTDOWN)
+        await scheduler.async_stop()
+
+    _run(run())
+
+
+def test_flood_then_off():
+    """The shutdown is queued and sent first after a flood filled the queue."""
+    sent = []
+
+    async def run():
+        scheduler = MaestroCommandScheduler(sent.append, rate=100, burst=1, max_queue=5)
+        flood = [
+            asyncio.create_task(scheduler.async_send(f"C|WriteParametri|{1200 + i}|1"))
+            for i in range(10)
+        ]
+        await asyncio.sleep(0)
+        await scheduler.async_send(SHUTDOWN)
+        results = await asyncio.gather(*flood, return_exceptions=True)
+        await scheduler.async_stop()
+        return scheduler, results
+
+    scheduler, results = _run(run())
+
+    rejected = [result for result in results if isinstance(result, Exception)]
+    assert len(rejected) == 5
+    assert scheduler.rejected == 5
+    # only the flood command sent before the shutdown was queued may precede it
+    assert sent.index(SHUTDOWN) <= 1
+    assert len(sent) == 6
+
+
+def test_peak_queue_depth():
+    """The peak depth holds until reset, then restarts from the current depth."""
+    sent = []
+
+    async def run():
+        scheduler = MaestroCommandScheduler(sent.append, rate=100, burst=1)
+        await asyncio.gather(
+            *(scheduler.async_send(f"C|WriteParametri|{40 + i}|1") for i in range(3))
+        )
+        await scheduler.async_stop()
+        return scheduler
+
+    scheduler = _run(run())
+
+    assert scheduler.queue_depth == 0
+    assert scheduler.metrics["peak_queue_depth"] == 3
+    assert scheduler.reset_peak_queue_depth() == 3
+    assert scheduler.reset_peak_queue_depth() == 0